@@ -4,25 +4,70 @@ import warnings
 warnings.filterwarnings("ignore", category=Warning)
 
 import requests
-from bs4 import BeautifulSoup
-import datetime
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+import io
 import re
 import tempfile
 import webbrowser
-import html
 import sys
 import os
 import subprocess
 from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 import urllib3
-import time
+from urllib3.util.retry import Retry
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
 
 urllib3.disable_warnings()
 
 BASE_URL = "https://confluence.atlassian.com"
 BLOG_URL = f"{BASE_URL}/cloud/blog"
 REQUEST_TIMEOUT = 10
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".jsm_cache")
+
+WEEKLY_URL_RE = re.compile(r'atlassian-cloud-changes-[a-z]+-\d+-to-[a-z]+-\d+-\d{4}$')
+NUMBERED_ITEM_RE = re.compile(r'(\d+)\.\s+(.*?)(?=\s\d+\.\s|\Z)')
+
+WEEKLY_LINK_STRAINER = SoupStrainer("a", href=WEEKLY_URL_RE)
+JSM_SECTION_STRAINER = SoupStrainer(["h1", "h2", "div"])
+
+HTML_ESCAPE_TABLE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#x27;",
+})
+
+LOZENGE_CLASSES = {
+    "coming soon": "coming-soon",
+    "rolling out": "rolling-out",
+    "launched": "launched",
+    "in progress": "in-progress",
+    "deprecated": "deprecated",
+    "removed": "removed",
+    "beta": "beta",
+    "experimental": "experimental",
+    "new this week": "new-this-week",
+}
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(total=2, backoff_factor=0.3),
+))
 
 def update_progress(progress, total):
     bar_length = 40
@@ -34,57 +79,108 @@ def update_progress(progress, total):
     if progress == total:
         sys.stdout.write('\n')
 
-def safe_request(url, timeout=REQUEST_TIMEOUT):
+def escape_html(text):
+    return text.translate(HTML_ESCAPE_TABLE)
+
+def safe_request(url, timeout=REQUEST_TIMEOUT, headers=None):
     try:
-        response = requests.get(url, timeout=timeout)
+        response = SESSION.get(url, timeout=timeout, headers=headers)
         response.raise_for_status()
         return response
     except requests.exceptions.RequestException:
         return None
 
+def get_cache_paths(url):
+    name = "blog_index" if url == BLOG_URL else url.rstrip("/").rsplit("/", 1)[-1]
+    base = os.path.join(CACHE_DIR, name)
+    return f"{base}.etag", f"{base}.html"
+
+def write_cache_file(path, data):
+    fd, temp_path = tempfile.mkstemp(dir=CACHE_DIR)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def prune_cache(urls):
+    keep = {os.path.basename(path) for url in urls for path in get_cache_paths(url)}
+    try:
+        names = os.listdir(CACHE_DIR)
+    except OSError:
+        return
+    for name in names:
+        path = os.path.join(CACHE_DIR, name)
+        if name not in keep and os.path.isfile(path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def fetch_html(url):
+    etag_path, html_path = get_cache_paths(url)
+    headers = {}
+    try:
+        with open(etag_path, encoding="utf-8") as f:
+            etag = f.read().strip()
+        if etag and os.path.exists(html_path):
+            headers["If-None-Match"] = etag
+    except OSError:
+        pass
+
+    resp = safe_request(url, headers=headers)
+    if not resp:
+        return None
+
+    if resp.status_code == 304:
+        try:
+            with open(html_path, "rb") as f:
+                return f.read()
+        except OSError:
+            resp = safe_request(url)
+            if not resp:
+                return None
+
+    etag = resp.headers.get("ETag")
+    if etag:
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            # Drop the old ETag first so a partial update can never pair it
+            # with a different body
+            if os.path.exists(etag_path):
+                os.remove(etag_path)
+            write_cache_file(html_path, resp.content)
+            write_cache_file(etag_path, etag.encode("utf-8"))
+        except OSError:
+            pass
+
+    return resp.content
+
+def release_date_key(url):
+    # WEEKLY_URL_RE guarantees the URL ends in -<month>-<day>-<year>
+    month_str, day, year = url.rsplit("-", 3)[1:]
+    return int(year), MONTHS.get(month_str[:3], 1), int(day)
+
 def get_weekly_release_urls():
     update_progress(1, 10)
-    resp = safe_request(BLOG_URL)
-    if not resp:
+    page = fetch_html(BLOG_URL)
+    if not page:
         return []
     
-    soup = BeautifulSoup(resp.text, "html.parser")
-    pattern = re.compile(r'atlassian-cloud-changes-[a-z]+-\d+-to-[a-z]+-\d+-\d{4}$')
-    links = []
-    seen = set()
-    
-    for a in soup.find_all("a", href=True):
-        href = a["href"]
-        if pattern.search(href):
-            if href.startswith("/"):
-                href = f"{BASE_URL}{href}"
-            if href not in seen:
-                links.append(href)
-                seen.add(href)
-    
-    def extract_date(url):
-        match = re.search(r'-to-([a-z]+)-(\d+)-(\d{4})$', url)
-        if not match:
-            return datetime.date(1970, 1, 1)
-        
-        month_str, day, year = match.groups()
-        try:
-            months = {
-                'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
-                'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
-            }
-            month = months.get(month_str[:3].lower(), 1)
-            return datetime.date(int(year), month, int(day))
-        except (ValueError, KeyError):
-            return datetime.date(1970, 1, 1)
+    soup = BeautifulSoup(page, HTML_PARSER, parse_only=WEEKLY_LINK_STRAINER)
+    links = list(dict.fromkeys(
+        f"{BASE_URL}{href}" if href.startswith("/") else href
+        for href in (a["href"] for a in soup.find_all("a"))
+    ))
     
-    links.sort(key=extract_date, reverse=True)
+    links.sort(key=release_date_key, reverse=True)
     update_progress(2, 10)
     return links[:2] if len(links) >= 2 else links
 
-@lru_cache(maxsize=32)
-def get_jsm_section_panels(html_content):
-    soup = BeautifulSoup(html_content, "html.parser")
+def get_jsm_section_panels(soup):
     headers = soup.select('h1, h2')
     header = next((h for h in headers if 'jira service management' in h.get_text(strip=True).lower()), None)
     
@@ -92,94 +188,153 @@ def get_jsm_section_panels(html_content):
         return []
     
     panels = []
-    for sib in header.find_all_next():
-        if sib.name in ['h1', 'h2'] and sib is not header:
+    for element in header.next_elements:
+        if element.name in ('h1', 'h2'):
             break
-        if sib.name == 'div' and 'panel-block' in sib.get('class', []):
-            panels.append(sib)
+        if element.name == 'div' and 'panel-block' in element.get('class', []):
+            panels.append(element)
     
     return panels
 
 def extract_text_with_formatting(element):
+    escape = escape_html
     result = []
-    
-    for content in element.contents:
-        if getattr(content, 'name', None) == 'a':
+    stack = [iter(element.contents)]
+
+    while stack:
+        content = next(stack[-1], None)
+        if content is None:
+            stack.pop()
+            continue
+
+        tag_name = getattr(content, 'name', None)
+        if tag_name == 'a':
             href = content.get('href', '')
             if href.startswith('/'):
                 href = f"{BASE_URL}{href}"
-            result.append(f'<a href="{html.escape(href)}" target="_blank" rel="noopener">{html.escape(content.get_text())}</a>')
-        elif getattr(content, 'name', None) in ('strong', 'b'):
-            result.append(f"<b>{html.escape(content.get_text())}</b>")
-        elif getattr(content, 'name', None):
-            result.append(extract_text_with_formatting(content))
+            result.append(f'<a href="{escape(href)}" target="_blank" rel="noopener">{escape(content.get_text())}</a>')
+        elif tag_name in ('strong', 'b'):
+            result.append(f"<b>{escape(content.get_text())}</b>")
+        elif tag_name:
+            stack.append(iter(content.contents))
         else:
-            result.append(html.escape(str(content)))
-    
+            result.append(escape(str(content)))
+
     return "".join(result)
 
 def convert_inline_numbered_list(text):
-    matches = list(re.finditer(r'(\d+)\.\s*([^\d]+?)(?=(?:\d+\.|$))', text))
+    if '1.' not in text or '2.' not in text:
+        return None
+    # Long whitespace runs make the NUMBERED_ITEM_RE lookahead quadratic
+    text = ' '.join(text.split())
+    matches = list(NUMBERED_ITEM_RE.finditer(text))
     if len(matches) >= 2:
         items = [m.group(2).strip() for m in matches]
-        li_items = "".join(f"<li>{html.escape(item)}</li>" for item in items)
+        li_items = "".join(f"<li>{escape_html(item)}</li>" for item in items)
         return f"<ol>{li_items}</ol>"
     return None
 
+def format_paragraph(p):
+    text = p.get_text(separator=" ", strip=True)
+    ol_html = convert_inline_numbered_list(text)
+    if ol_html:
+        return ol_html
+    return f"<p>{extract_text_with_formatting(p)}</p>"
+
+def format_list(list_tag):
+    list_type = list_tag.name
+    list_items = "".join(f"<li>{extract_text_with_formatting(li)}</li>" 
+                        for li in list_tag.find_all('li', recursive=False))
+    return f"<{list_type}>{list_items}</{list_type}>"
+
+DESCRIPTION_FORMATTERS = {
+    'p': format_paragraph,
+    'ol': format_list,
+    'ul': format_list,
+}
+
 def extract_panel_info(panel):
-    h4 = panel.find('h4')
+    h4 = None
+    labels = []
+    content_div = None
+    for tag in panel.descendants:
+        if not isinstance(tag, Tag):
+            continue
+        tag_name = tag.name
+        if tag_name == 'h4':
+            if h4 is None:
+                h4 = tag
+        elif tag_name == 'span':
+            if 'status-macro' in tag.get('class', ()):
+                labels.append(tag.get_text(strip=True))
+        elif tag_name == 'div':
+            if content_div is None and 'panel-block-content' in tag.get('class', ()):
+                content_div = tag
+    
     name = h4.get_text(strip=True) if h4 else ""
-    labels = [span.get_text(strip=True) for span in panel.find_all('span', class_='status-macro')]
-    content_div = panel.find('div', class_='panel-block-content')
-    description_parts = []
+    description = io.StringIO()
     
     if content_div:
         for child in content_div.children:
-            tag_name = getattr(child, 'name', None)
-            
-            if tag_name == 'p':
-                text = child.get_text(separator=" ", strip=True)
-                ol_html = convert_inline_numbered_list(text)
-                if ol_html:
-                    description_parts.append(ol_html)
-                else:
-                    description_parts.append(f"<p>{extract_text_with_formatting(child)}</p>")
-            elif tag_name in ('ol', 'ul'):
-                list_type = tag_name
-                list_items = "".join(f"<li>{extract_text_with_formatting(li)}</li>" 
-                                    for li in child.find_all('li', recursive=False))
-                description_parts.append(f"<{list_type}>{list_items}</{list_type}>")
+            if not isinstance(child, Tag):
+                continue
+            formatter = DESCRIPTION_FORMATTERS.get(child.name)
+            if formatter:
+                description.write(formatter(child))
     
     return {
         "name": name,
-        "description_html": "".join(description_parts),
+        "description_html": description.getvalue(),
         "status_labels": ", ".join(labels)
     }
 
-def fetch_week_entries(url, progress_value):
-    resp = safe_request(url)
-    if not resp:
+def get_panel_name(panel):
+    h4 = panel.find('h4')
+    return h4.get_text(strip=True) if h4 else ""
+
+def fetch_week_panels(url, progress_value):
+    page = fetch_html(url)
+    if not page:
         return []
     
-    panels = get_jsm_section_panels(resp.text)
+    soup = BeautifulSoup(page, HTML_PARSER, parse_only=JSM_SECTION_STRAINER)
+    panels = get_jsm_section_panels(soup)
     if not panels:
         return []
     
-    entries = []
+    named_panels = []
     for panel in panels:
+        name = get_panel_name(panel)
+        if name:
+            named_panels.append((name, panel))
+    
+    update_progress(progress_value, 10)
+    return named_panels
+
+def extract_new_entries(this_week_panels, last_week_names):
+    entries = []
+    for name, panel in this_week_panels:
+        if normalize_name(name) in last_week_names:
+            continue
         try:
-            entry = extract_panel_info(panel)
-            if entry["name"]:
-                entries.append(entry)
+            entries.append(extract_panel_info(panel))
         except Exception:
             pass
     
-    update_progress(progress_value, 10)
     return entries
 
+@lru_cache(maxsize=512)
 def normalize_name(name):
     return ' '.join(name.lower().strip().split())
 
+@lru_cache(maxsize=64)
+def confluence_lozenge(text):
+    normalized = ' '.join(text.lower().split())
+    css_class = LOZENGE_CLASSES.get(normalized)
+    if css_class is None:
+        css_class = next((val for key, val in LOZENGE_CLASSES.items() if key in normalized), "")
+    return f'<span class="lozenge {css_class}">{escape_html(text)}</span>'
+
 def write_and_open_html(new_entries, this_week_url, last_week_url):
     css = """
         body {
@@ -274,24 +429,7 @@ def write_and_open_html(new_entries, this_week_url, last_week_url):
         }
     """
     
-    status_map = {
-        "coming soon": "coming-soon",
-        "rolling out": "rolling-out",
-        "launched": "launched",
-        "in progress": "in-progress",
-        "deprecated": "deprecated",
-        "removed": "removed",
-        "beta": "beta",
-        "experimental": "experimental",
-        "new this week": "new-this-week",
-    }
-    
-    def confluence_lozenge(text):
-        text_lower = text.lower()
-        css_class = next((val for key, val in status_map.items() if key in text_lower), "")
-        return f'<span class="lozenge {css_class}">{html.escape(text)}</span>'
-    
-    html_parts = [
+    header_html = "\n".join([
         "<!DOCTYPE html>",
         "<html>",
         "<head>",
@@ -305,28 +443,9 @@ def write_and_open_html(new_entries, this_week_url, last_week_url):
         f'<div class="url">Current week: <a href="{this_week_url}" target="_blank" rel="noopener">{this_week_url}</a></div>',
         f'<div class="url">Last week: <a href="{last_week_url}" target="_blank" rel="noopener">{last_week_url}</a></div>',
         "<hr>"
-    ]
-    
-    if new_entries:
-        for entry in new_entries:
-            panel_parts = [
-                '<div class="panel">',
-                f"<h2>{html.escape(entry['name'])}</h2>"
-            ]
-            
-            if entry['status_labels']:
-                lozenges = " ".join(confluence_lozenge(label) for label in entry["status_labels"].split(","))
-                panel_parts.append(f'<div class="status">{lozenges}</div>')
-            
-            if entry['description_html']:
-                panel_parts.append(entry['description_html'])
-            
-            panel_parts.append("</div>")
-            html_parts.append("".join(panel_parts))
-    else:
-        html_parts.append("<p>No new JSM entries this week.</p>")
+    ])
     
-    html_parts.extend([
+    footer_html = "\n".join([
         "</div>",
         "<script>",
         "document.querySelectorAll('a').forEach(function(link) {",
@@ -338,10 +457,29 @@ def write_and_open_html(new_entries, this_week_url, last_week_url):
         "</html>"
     ])
     
-    html_content = "\n".join(html_parts)
-    
     with tempfile.NamedTemporaryFile('w', delete=False, suffix='.html') as f:
-        f.write(html_content)
+        write = f.write
+        write(header_html)
+        write("\n")
+        
+        if new_entries:
+            for entry in new_entries:
+                write('<div class="panel">\n')
+                write(f"<h2>{escape_html(entry['name'])}</h2>\n")
+                
+                if entry['status_labels']:
+                    lozenges = " ".join(confluence_lozenge(label) for label in entry["status_labels"].split(","))
+                    write(f'<div class="status">{lozenges}</div>\n')
+                
+                if entry['description_html']:
+                    write(entry['description_html'])
+                    write("\n")
+                
+                write("</div>\n")
+        else:
+            write("<p>No new JSM entries this week.</p>\n")
+        
+        write(footer_html)
         temp_html_path = f.name
     
     update_progress(9, 10)
@@ -352,7 +490,6 @@ def quit_terminal_app():
     if sys.platform == 'darwin':  # macOS
         print("\nTask completed successfully. Closing Terminal...")
         sys.stdout.flush()
-        time.sleep(1)  # Give time for the browser to open
 
         # Use AppleScript to detach the script and then quit the application
         applescript = '''
@@ -383,22 +520,22 @@ def main():
             return 1
 
         this_week_url, last_week_url = urls[0], urls[1]
+        prune_cache([BLOG_URL, this_week_url, last_week_url])
 
         with ThreadPoolExecutor(max_workers=2) as executor:
-            this_week_future = executor.submit(fetch_week_entries, this_week_url, 4)
-            last_week_future = executor.submit(fetch_week_entries, last_week_url, 6)
+            this_week_future = executor.submit(fetch_week_panels, this_week_url, 4)
+            last_week_future = executor.submit(fetch_week_panels, last_week_url, 6)
 
-            this_week_entries = this_week_future.result()
-            last_week_entries = last_week_future.result()
+            this_week_panels = this_week_future.result()
+            last_week_panels = last_week_future.result()
 
-        if not this_week_entries:
+        if not this_week_panels:
             print("\nError: No entries found for this week.")
             quit_terminal_app()
             return 1
 
-        last_week_names = {normalize_name(e['name']) for e in last_week_entries}
-        new_entries = [entry for entry in this_week_entries
-                      if normalize_name(entry['name']) not in last_week_names]
+        last_week_names = {normalize_name(name) for name, _ in last_week_panels}
+        new_entries = extract_new_entries(this_week_panels, last_week_names)
 
         update_progress(8, 10)
         write_and_open_html(new_entries, this_week_url, last_week_url)